@@ -1,81 +1,96 @@
 #!/bin/env python3.11
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from icecream import ic
 
 from src.database.database import DatabaseGenerator
-from src.database.import_csv import gather_csv_paths
-
-
-def students_str_map(value: str, column: str) -> int | str:
-    """
-    Map for normalising the data.
-    todo: implement import map from file, either toml or yaml.
-
-    Args:
-        value: str: Value to Map
-        column: str: Column Name
-
-    Returns:
-        int: value according to map
-
-    """
-    if not isinstance(value, str):
-        return value  # type: ignore
-    match value.upper():
-        case "YES":
-            return 1
-        case "NO":
-            return 0
-        case "OTHER":
-            if column == "reason":
-                return 3
-            elif column == "guardian":
-                return 2
-            elif column in {"Mjob", "Fjob"}:
-                return 4
-        case "GP":
-            return 0
-        case "MS":
-            return 1
-        case "F":
-            return 0
-        case "M":
-            return 1
-        case "U":
-            return 0
-        case "R":
-            return 1
-        case "LE3":
-            return 0
-        case "GT3":
-            return 1
-        case "T":
-            return 0
-        case "A":
-            return 1
-        case "TEACHER":
-            return 0
-        case "HEALTH":
-            return 1
-        case "SERVICES":
-            return 2
-        case "AT_HOME":
-            return 3
-        case "HOME":
-            return 0
-        case "REPUTATION":
-            return 1
-        case "COURSE":
-            return 2
-        case "MOTHER":
-            return 0
-        case "FATHER":
-            return 1
-        case _:
-            return value
+from src.database.import_csv import (
+    built_marker_path,
+    database_is_current,
+    gather_csv_paths,
+    mark_database_built,
+)
+
+
+# Map for normalising the data.
+# todo: implement import map from file, either toml or yaml.
+BASE_MAP: dict[str, int] = {
+    "YES": 1,
+    "NO": 0,
+    "GP": 0,
+    "MS": 1,
+    "F": 0,
+    "M": 1,
+    "U": 0,
+    "R": 1,
+    "LE3": 0,
+    "GT3": 1,
+    "T": 0,
+    "A": 1,
+    "TEACHER": 0,
+    "HEALTH": 1,
+    "SERVICES": 2,
+    "AT_HOME": 3,
+    "HOME": 0,
+    "REPUTATION": 1,
+    "COURSE": 2,
+    "MOTHER": 0,
+    "FATHER": 1,
+}
+COLUMN_OVERRIDES: dict[str, dict[str, int]] = {
+    "reason": {"OTHER": 3},
+    "guardian": {"OTHER": 2},
+    "Mjob": {"OTHER": 4},
+    "Fjob": {"OTHER": 4},
+}
+# Known column dtypes, so the CSV reader can skip type inference.
+STUDENT_DTYPES: dict[str, str] = {
+    "school": "string",
+    "sex": "string",
+    "age": "int8",
+    "address": "string",
+    "famsize": "string",
+    "Pstatus": "string",
+    "Medu": "int8",
+    "Fedu": "int8",
+    "Mjob": "string",
+    "Fjob": "string",
+    "reason": "string",
+    "guardian": "string",
+    "traveltime": "int8",
+    "studytime": "int8",
+    "failures": "int8",
+    "schoolsup": "string",
+    "famsup": "string",
+    "paid": "string",
+    "activities": "string",
+    "nursery": "string",
+    "higher": "string",
+    "internet": "string",
+    "romantic": "string",
+    "famrel": "int8",
+    "freetime": "int8",
+    "goout": "int8",
+    "Dalc": "int8",
+    "Walc": "int8",
+    "health": "int8",
+    "absences": "int16",
+    "G1": "int8",
+    "G2": "int8",
+    "G3": "int8",
+}
+DTYPE_SCHEMAS: dict[str, dict[str, str]] = {
+    "students_description": {
+        "DID": "int64",
+        "Column Title": "string",
+        "Description": "string",
+    },
+    "students_math": {"MUID": "int64", **STUDENT_DTYPES},
+    "students_portuguese": {"PUID": "int64", **STUDENT_DTYPES},
+}
 
 
 def prepare_tables(table_dict):
@@ -87,10 +102,12 @@ def prepare_tables(table_dict):
     table_dict["students_description"].index_label = "DID"
     table_dict["students_math"].index_label = "MUID"
     table_dict["students_portuguese"].index_label = "PUID"
-    [tab.modify_index() for tab in table_dict.values()]
-    [tab.dataframe_to_csv() for tab in table_dict.values()]
-    ic(table_dict["students_description"].dataframe)
-    # [tab.normalise_data(students_str_map) for tab in table_dict.values()]
+    for tab in table_dict.values():
+        tab.modify_index()
+        tab.dataframe_to_csv()
+    if os.environ.get("DEBUG_IC"):
+        ic(table_dict["students_description"].dataframe)
+    # [tab.normalise_data(BASE_MAP, COLUMN_OVERRIDES) for tab in table_dict.values()]
 
 
 def main() -> int:
@@ -101,12 +118,19 @@ def main() -> int:
 
     """
     db_folder: Path = Path("data/").resolve()
-
-    import_csv = gather_csv_paths(db_folder)
-    ic(import_csv)
+    if database_is_current(db_folder, "students"):
+        print("students.db is up to date.")
+        return 0
+    # Only marked as built again once every table has been written.
+    built_marker_path(db_folder, "students").unlink(missing_ok=True)
+
+    import_csv = gather_csv_paths(db_folder, DTYPE_SCHEMAS)
+    if os.environ.get("DEBUG_IC"):
+        ic(import_csv)
     prepare_tables(import_csv)
     db_dict = DatabaseGenerator.create_from_dict(import_csv)
     database = db_dict["students"]
+    mark_database_built(db_folder, "students")
 
     return 0
 
@@ -3,22 +3,25 @@ Database control modules
 """
 from __future__ import annotations
 
+import datetime
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from sqlite3 import Connection, Cursor
-from typing import Optional, Protocol
+from typing import Iterator, Optional, Protocol
 
 import pandas as pd
+import pyarrow as pa
 from icecream import ic
 
 
-class NormaliseMap(Protocol):
-    """
-    Protocol for normalizing tables.
-    """
-
-    def __call__(self, value: str, column: str) -> int:
-        ...
+# The database is rebuilt from the CSVs, so durability is traded for write speed.
+SQLITE_PRAGMAS: tuple[str, ...] = (
+    "journal_mode=WAL",
+    "synchronous=OFF",
+    "temp_store=MEMORY",
+    "cache_size=-262144",
+)
 
 
 class DBTable(Protocol):
@@ -32,13 +35,20 @@ class DBTable(Protocol):
     database: Database
     dataframe: pd.DataFrame
     index_label: str
-
-    def normalise_data(self, data_map: NormaliseMap) -> DBTable:
+    chunksize: int | None
+    dtype_schema: dict[str, str] | None
+
+    def normalise_data(
+            self,
+            data_map: dict[str, int],
+            column_overrides: dict[str, dict[str, int]] | None = None,
+    ) -> DBTable:
         """
         Normalise a dataframe for analysis.
 
         Args:
-            data_map: Map to normalise data.
+            data_map: Map of upper case value to normalised value.
+            column_overrides: Per column entries merged over data_map.
 
         Returns:
             DBTable: Self
@@ -79,20 +89,46 @@ class DBTable(Protocol):
         """
         ...
 
+    def read_chunks(self, separator: str = ";") -> Iterator[pd.DataFrame]:
+        """
+        Reads the CSV in chunks of chunksize rows.
+
+        Args:
+            separator: separator used by the CSV. Default is ";"
+
+        Returns:
+            Iterator[pd.DataFrame]: chunks of the CSV.
+        """
+        ...
+
     def add(self) -> DBTable:
         ...
 
 
 class Database:
     """
-    SQL Lite Database with tables.
+    SQL Lite Database with tables. Tables are also available as attributes
+    by name.
     """
 
+    __slots__ = (
+        "name",
+        "tables",
+        "by_name",
+        "folder",
+        "path",
+        "connection",
+        "cursor",
+        "if_exists",
+        "transaction_depth",
+    )
+
     def __init__(
             self, name: str, folder: Optional[str | Path] = None, if_exists: str = "replace"
     ):
         self.name: str = name
         self.tables: list[DBTable] = list()
+        self.by_name: dict[str, DBTable] = dict()
         self.folder = folder
         if folder is None:
             self.folder = Path("../data/").resolve()
@@ -105,11 +141,20 @@ class Database:
         self.connection: Connection | None = None
         self.cursor: Cursor | None = None
         self.if_exists: str = if_exists
+        self.transaction_depth: int = 0
         self.connect()
 
     def __repr__(self):
         return f"Database(name='{self.name}', tables={self.table_names})"
 
+    def __getattr__(self, name: str) -> DBTable:
+        if name == "by_name":
+            raise AttributeError(name)
+        try:
+            return self.by_name[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
     # def __del__(self):
     #     if hasattr(self, "connection"):
     #         self.connection.close()
@@ -122,15 +167,41 @@ class Database:
 
     def connect(self) -> Database:
         """
-        Connect to the database. Sets the connection and cursor.
+        Connect to the database. Sets the connection, cursor and SQLITE_PRAGMAS.
 
         Returns:
             Database: self
         """
         self.connection = sqlite3.Connection(self.path)
         self.cursor = self.connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            self.cursor.execute(f"PRAGMA {pragma}")
         return self
 
+    @contextmanager
+    def transaction(self) -> Iterator[Database]:
+        """
+        Groups writes, DDL included, into a single commit. Nested transactions
+        join the outermost one, which commits on success and rolls back on error.
+
+        Yields:
+            Database: self
+        """
+        if self.transaction_depth == 0 and not self.connection.in_transaction:
+            # sqlite3 only opens a transaction implicitly before DML statements.
+            self.cursor.execute("BEGIN")
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.connection.rollback()
+            raise
+        self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.connection.commit()
+
     @property
     def table_names(self):
         """
@@ -153,9 +224,9 @@ class Database:
         table.database = self
         table.db_name = self.name
         self.tables.append(table)
-        if hasattr(self, table.name):
+        if table.name in self.by_name:
             ic(f"changing {table.name} to new value.")
-        self.__setattr__(table.name, table)
+        self.by_name[table.name] = table
         self.add_table_to_database(table)
 
         return self
@@ -190,7 +261,8 @@ class Database:
 
     def add_table_to_database(self, table: DBTable) -> Database:
         """
-        Adds table to sql database.
+        Adds table to sql database. Chunked tables are read and written chunk
+        by chunk.
 
         Args:
             table:
@@ -198,14 +270,134 @@ class Database:
         Returns:
             Database: self
         """
-        table.dataframe.to_sql(
-            name=table.name,
-            con=self.connection,
-            if_exists=self.if_exists,
-            index_label=table.index_label,
+        with self.transaction():
+            if table.chunksize is None:
+                self.insert_dataframe(
+                    table.name, table.dataframe, table.index_label, self.if_exists
+                )
+                return self
+
+            if_exists = self.if_exists
+            for chunk in table.read_chunks():
+                if table.index_label in chunk.columns:
+                    chunk.set_index(table.index_label, inplace=True)
+                self.insert_dataframe(table.name, chunk, table.index_label, if_exists)
+                if_exists = "append"
+        return self
+
+    def insert_dataframe(
+            self, name: str, dataframe: pd.DataFrame, index_label: str, if_exists: str
+    ) -> Database:
+        """
+        Creates the table and bulk inserts the rows with executemany. Unlike
+        DataFrame.to_sql this never commits, the caller owns the transaction.
+
+        Args:
+            name: table name.
+            dataframe: rows to insert, the index is written as index_label.
+            index_label: name of the index column.
+            if_exists: "replace", "append" or "fail".
+
+        Returns:
+            Database: self
+        """
+        dataframe = dataframe.reset_index(names=index_label)
+        table = self.quote_identifier(name)
+        columns_ddl = ", ".join(
+            f"{self.quote_identifier(column)} {self.sql_type(dtype)}"
+            for column, dtype in dataframe.dtypes.items()
+        )
+        if if_exists == "replace":
+            self.cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        if_not_exists = "IF NOT EXISTS " if if_exists == "append" else ""
+        self.cursor.execute(f"CREATE TABLE {if_not_exists}{table} ({columns_ddl})")
+        self.cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS "
+            f"{self.quote_identifier(f'ix_{name}_{index_label}')} "
+            f"ON {table} ({self.quote_identifier(index_label)})"
+        )
+        # Python objects with None for missing values, which sqlite3 can bind.
+        rows = dataframe.astype(object).where(dataframe.notna(), None)
+        for column, dtype in dataframe.dtypes.items():
+            if self.is_temporal(dtype):
+                rows[column] = rows[column].map(self.sql_value, na_action="ignore")
+        placeholders = ", ".join("?" * len(dataframe.columns))
+        self.cursor.executemany(
+            f"INSERT INTO {table} VALUES ({placeholders})",
+            rows.itertuples(index=False, name=None),
         )
         return self
 
+    @staticmethod
+    def quote_identifier(identifier) -> str:
+        """
+        Args:
+            identifier: table, column or index name.
+
+        Returns:
+            str: identifier in double quotes, embedded quotes doubled.
+        """
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    @staticmethod
+    def is_temporal(dtype) -> bool:
+        """
+        Args:
+            dtype: pandas dtype of a column.
+
+        Returns:
+            bool: True for date, time, datetime and timedelta columns.
+        """
+        if isinstance(dtype, pd.ArrowDtype):
+            return pa.types.is_temporal(dtype.pyarrow_dtype)
+        return pd.api.types.is_datetime64_any_dtype(
+            dtype
+        ) or pd.api.types.is_timedelta64_dtype(dtype)
+
+    @staticmethod
+    def sql_value(value):
+        """
+        Converts temporal values to types sqlite3 can bind, as DataFrame.to_sql
+        does: ISO strings for dates and times, nanoseconds for timedeltas.
+
+        Args:
+            value: a single non missing value.
+
+        Returns:
+            str | int: value sqlite3 can bind.
+        """
+        if isinstance(value, datetime.timedelta):
+            return pd.Timedelta(value).value
+        if isinstance(value, datetime.datetime):
+            return value.isoformat(sep=" ")
+        return value.isoformat()
+
+    @staticmethod
+    def sql_type(dtype) -> str:
+        """
+        Args:
+            dtype: pandas dtype of a column.
+
+        Returns:
+            str: SQLite column type for dtype.
+        """
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(dtype):
+            return "REAL"
+        if isinstance(dtype, pd.ArrowDtype):
+            if pa.types.is_date(dtype.pyarrow_dtype):
+                return "DATE"
+            if pa.types.is_time(dtype.pyarrow_dtype):
+                return "TIME"
+            if pa.types.is_duration(dtype.pyarrow_dtype):
+                return "INTEGER"
+        if pd.api.types.is_timedelta64_dtype(dtype):
+            return "INTEGER"
+        if Database.is_temporal(dtype):
+            return "TIMESTAMP"
+        return "TEXT"
+
 
 class DatabaseGenerator:
     """
@@ -224,15 +416,20 @@ class DatabaseGenerator:
             dict[str, Database]: dictionary of [database_name: database]
         """
         return_dict: dict[str, Database] = dict()
+        if not db_dict:
+            return return_dict
+        folder = Path(next(iter(db_dict.values())).csv_path).resolve().parent
+        db_tables: dict[str, list[DBTable]] = dict()
         for table in db_dict.values():
-            if table.db_name in return_dict.keys():
-                table.database = return_dict[table.db_name]
-
-            else:
-                db_name = table.db_name
-                folder = Path(db_dict.copy().popitem()[1].csv_path).resolve().parent
-                db = Database(name=db_name, folder=folder)
-                return_dict[db.name] = db
-                table.database = db
-            table.add()
+            if table.db_name not in return_dict:
+                return_dict[table.db_name] = Database(
+                    name=table.db_name, folder=folder
+                )
+            table.database = return_dict[table.db_name]
+            db_tables.setdefault(table.db_name, list()).append(table)
+
+        for db_name, tables in db_tables.items():
+            with return_dict[db_name].transaction():
+                for table in tables:
+                    table.add()
         return return_dict
@@ -4,35 +4,112 @@ Import data from csv files.
 """
 from __future__ import annotations
 
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Protocol
+from typing import NamedTuple, Protocol
 
 from .table import DBTable
 
 
-def gather_csv_paths(data_folder: str | Path) -> dict[str, DBTable]:
+class CsvEntry(NamedTuple):
+    """
+    A (database name)_(table name).csv file.
+    """
+
+    db_name: str
+    table_name: str
+    path: Path
+
+
+def built_marker_path(data_folder: str | Path, db_name: str) -> Path:
+    """
+    Args:
+        data_folder: folder which contains the databases.
+        db_name: name of the database.
+
+    Returns:
+        Path: marker touched once (database name).db has been fully built.
+    """
+    return Path(data_folder, f"{db_name}.db.built")
+
+
+def mark_database_built(data_folder: str | Path, db_name: str) -> Path:
+    """
+    Records that (database name).db was built successfully.
+
+    Args:
+        data_folder: folder which contains the databases.
+        db_name: name of the database.
+
+    Returns:
+        Path: the marker.
+    """
+    marker = built_marker_path(data_folder, db_name)
+    marker.touch()
+    return marker
+
+
+def database_is_current(data_folder: str | Path, db_name: str) -> bool:
+    """
+    Checks if (database name).db was built after all of its
+    (database name)_(table name).csv files last changed. The build marker is
+    compared rather than the .db, which is touched as soon as it is opened.
+
+    Args:
+        data_folder: folder which contains the databases.
+        db_name: name of the database.
+
+    Returns:
+        bool: True if the database was built and no csv has changed since.
+    """
+    marker = built_marker_path(data_folder, db_name)
+    if not (marker.exists() and Path(data_folder, f"{db_name}.db").exists()):
+        return False
+    built_mtime = marker.stat().st_mtime
+    return all(
+        csv.stat().st_mtime <= built_mtime
+        for csv in Path(data_folder).glob(f"{db_name}_*.csv")
+    )
+
+
+def gather_csv_paths(
+        data_folder: str | Path, dtype_schemas: dict[str, dict[str, str]] | None = None
+) -> dict[str, DBTable]:
     """
     Only gathers csv files with the following format:
     (database name)_(table name).csv
 
+    The database name is everything before the first underscore.
+
     Args:
         data_folder: folder which contains the databases.
+        dtype_schemas: dtype of each column, keyed by csv file stem.
 
     Returns:
         dict[str, DBTable]: All tables with associated connections and cursors.
     """
-    import_dict: dict[str, DBTable] = dict()
-    for csv in glob(f"{data_folder}/*_*.csv"):
-        path = Path(csv)
+    entries: list[CsvEntry] = list()
+    for path in Path(data_folder).glob("*_*.csv"):
         table_name: str
         database_name: str
-        total_name = path.stem
-        (
-            database_name,
-            table_name,
-        ) = total_name.split("_")
-        import_dict[total_name] = DBTable(
-            name=table_name, db_name=database_name, csv_path=path
+        database_name, table_name = path.stem.split("_", 1)
+        entries.append(
+            CsvEntry(db_name=database_name, table_name=table_name, path=path)
+        )
+    if not entries:
+        return dict()
+    if dtype_schemas is None:
+        dtype_schemas = dict()
+
+    def create_table(entry: CsvEntry) -> DBTable:
+        return DBTable(
+            name=entry.table_name,
+            db_name=entry.db_name,
+            csv_path=entry.path,
+            dtype_schema=dtype_schemas.get(entry.path.stem),
         )
-    return import_dict
+
+    # Each DBTable parses its CSV on creation, so create them concurrently.
+    with ThreadPoolExecutor(max_workers=min(8, len(entries))) as executor:
+        tables = executor.map(create_table, entries)
+        return {entry.path.stem: table for entry, table in zip(entries, tables)}
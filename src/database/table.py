@@ -4,22 +4,41 @@ Table class for sqlite database.
 """
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
-from functools import partial
 from pathlib import Path
 from sqlite3 import Connection, Cursor
-from typing import Any, Protocol
+from typing import Any, Iterator, Protocol
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
+# Parquet metadata key holding the dtype_schema the copy was written with.
+PARQUET_SCHEMA_KEY: bytes = b"dtype_schema"
 
-class NormaliseMap(Protocol):
-    """
-    Protocol for normalizing tables.
+
+def arrow_type(dtype: str) -> pa.DataType:
     """
+    Resolves a pandas dtype name to the Arrow type the CSV reader should use,
+    so dtype_schema means the same with and without chunksize.
 
-    def __call__(self, value: str, column: str) -> int:
-        ...
+    Args:
+        dtype: pandas dtype name, e.g. "int8", "float", "string" or "category".
+
+    Returns:
+        pa.DataType: Arrow type for dtype.
+    """
+    pandas_dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(pandas_dtype, pd.ArrowDtype):
+        return pandas_dtype.pyarrow_dtype
+    if isinstance(pandas_dtype, pd.CategoricalDtype):
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(pandas_dtype, pd.StringDtype) or pandas_dtype == object:
+        return pa.string()
+    return pa.from_numpy_dtype(getattr(pandas_dtype, "numpy_dtype", pandas_dtype))
 
 
 class Database(Protocol):
@@ -62,64 +81,246 @@ class DBTable:
     dataframe: pd.DataFrame = field(init=False, repr=False)
     database: Database = field(repr=False, default=None)
     index: Any = field(repr=False, default=None)
+    chunksize: int | None = field(repr=False, default=None)
+    # pandas dtype name of each column, see arrow_type.
+    dtype_schema: dict[str, str] | None = field(repr=False, default=None)
 
     def __post_init__(self):
         self.csv_to_dataframe()
 
+    @property
+    def parquet_path(self) -> Path:
+        """
+        Returns:
+            Path: Parquet copy of the CSV, kept alongside it.
+        """
+        return Path(self.csv_path).with_suffix(".parquet")
+
+    @property
+    def parquet_is_current(self) -> bool:
+        """
+        Returns:
+            bool: True if the Parquet copy is at least as new as the CSV and was
+                written with the current dtype_schema.
+        """
+        if not (
+                self.parquet_path.exists()
+                and self.parquet_path.stat().st_mtime
+                >= Path(self.csv_path).stat().st_mtime
+        ):
+            return False
+        metadata = pq.read_schema(self.parquet_path).metadata or dict()
+        return metadata.get(PARQUET_SCHEMA_KEY) == self._schema_metadata()
+
+    def _schema_metadata(self) -> bytes:
+        """
+        Returns:
+            bytes: dtype_schema serialised for the Parquet metadata.
+        """
+        return json.dumps(self.dtype_schema, sort_keys=True).encode()
+
     # def __del__(self):
     #     if self.database is not None:
     #         self.database.cursor.execute(f"DROP TABLE IF EXISTS {self.name}")
 
-    def normalise_data(self, data_map: NormaliseMap) -> DBTable:
+    def normalise_data(
+            self,
+            data_map: dict[str, int],
+            column_overrides: dict[str, dict[str, int]] | None = None,
+    ) -> DBTable:
         """
         Normalise a dataframe for analysis.
 
+        Values are matched case-insensitively, values not in the map are kept.
+
         Args:
-            data_map: Map to normalise data.
+            data_map: Map of upper case value to normalised value.
+            column_overrides: Per column entries merged over data_map.
 
         Returns:
             DBTable: Self
 
+        Raises:
+            ValueError: if the table is chunked, it has no dataframe.
         """
+        if self.chunksize is not None:
+            raise ValueError(
+                f"{self.name} is chunked, its chunks are written to the database "
+                "as read and cannot be normalised."
+            )
+        if column_overrides is None:
+            column_overrides = dict()
+        # Build each lookup once, not once per column.
+        base_lookup = self._lookup(data_map)
+        column_lookups = {
+            column: self._lookup({**data_map, **overrides})
+            for column, overrides in column_overrides.items()
+        }
         for column in self.dataframe.columns:
-            partial_map = partial(data_map, column=column)
-            self.dataframe[column] = self.dataframe[column].map(partial_map)
+            column_series = self.dataframe[column]
+            if not (
+                    pd.api.types.is_object_dtype(column_series)
+                    or pd.api.types.is_string_dtype(column_series)
+            ):
+                continue
+            keys, values = column_lookups.get(column, base_lookup)
+            mapped = self._map_categories(column_series, keys, values)
+            if mapped is not None:
+                self.dataframe[column] = mapped
         return self
 
+    @staticmethod
+    def _lookup(mapping: dict[str, int]) -> tuple[pd.Index, np.ndarray]:
+        """
+        Splits a map into an Index of keys and an aligned array of values.
+
+        Lower and title case keys are added so common casings match as is.
+
+        Args:
+            mapping: Map of upper case value to normalised value.
+
+        Returns:
+            tuple[pd.Index, np.ndarray]: keys and values.
+        """
+        mapping = (
+                {key.lower(): value for key, value in mapping.items()}
+                | {key.title(): value for key, value in mapping.items()}
+                | mapping
+        )
+        return (
+            pd.Index(list(mapping.keys())),
+            np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping)),
+        )
+
+    @staticmethod
+    def _map_categories(
+            series: pd.Series, keys: pd.Index, values: np.ndarray
+    ) -> pd.Series | None:
+        """
+        Maps the distinct values of a column, then broadcasts them by category code.
+
+        Args:
+            series: String column.
+            keys: Values to map, from _lookup.
+            values: Normalised value for each key, from _lookup.
+
+        Returns:
+            pd.Series | None: Mapped column, or None if no value is in keys.
+        """
+        categorical = series.astype("category").cat
+        categories = categorical.categories
+        positions = keys.get_indexer(categories)
+        unmapped = positions < 0
+        if unmapped.any():
+            # Non-string values, e.g. in object columns, are compared as is.
+            upper = categories[unmapped].map(
+                lambda value: value.upper() if isinstance(value, str) else value
+            )
+            positions[unmapped] = keys.get_indexer(upper)
+            unmapped = positions < 0
+        if unmapped.all():
+            return None
+        values = values.take(positions)
+        codes = categorical.codes.to_numpy()
+        if not unmapped.any() and (codes >= 0).all():
+            return pd.Series(values[codes], index=series.index)
+        new_categories = np.array(categories, dtype=object)
+        new_categories[~unmapped] = values[~unmapped].tolist()
+        return pd.Series(new_categories[codes], index=series.index).where(
+            codes >= 0, series
+        )
+
     def modify_index(self) -> DBTable:
         """
-        Modifies the index of the dataframe.
+        Modifies the index of the dataframe. Does nothing for chunked tables,
+        each chunk is indexed by index_label as it is written.
 
         Returns:
             self
         """
-        if self.index_label in self.dataframe.columns:
+        if self.chunksize is not None:
+            return self
+
+        elif self.dataframe.index.name == self.index_label:
+            return self
+
+        elif self.index_label in self.dataframe.columns:
             self.dataframe.set_index(self.index_label, inplace=True)
             return self
 
-        elif self.index_label not in self.dataframe.columns and self.index is None:
-            self.index = list(range(len(self.dataframe)))
+        elif self.index is None:
+            self.index = pd.RangeIndex(len(self.dataframe), name=self.index_label)
+            self.dataframe.index = self.index
+            return self
 
-        self.dataframe.insert(0, self.index_label, self.index, allow_duplicates=False)
-        self.dataframe.set_index(self.index_label, inplace=True)
+        self.dataframe.index = pd.Index(self.index, name=self.index_label)
         return self
 
     def csv_to_dataframe(self, separator: str = ";") -> DBTable:
         """
         Imports the CSV to a DataFrame.
 
+        Reads the Parquet copy instead when it is newer than the CSV and was
+        written with the same dtype_schema, so the CSV is only parsed when it
+        or the schema has changed since the last dataframe_to_csv. If
+        chunksize is set the CSV is not loaded and dataframe is None, the
+        database streams it with read_chunks instead. Columns in dtype_schema
+        are read as that pandas dtype, Arrow backed, rather than inferred.
+
         Args:
             separator: separator used by the CSV. Default is ";"
 
         Returns:
             DBTable: Self
         """
-        self.dataframe = pd.read_csv(self.csv_path, sep=separator)
+        if self.chunksize is not None:
+            self.dataframe = None
+            return self
+
+        if self.parquet_is_current:
+            self.dataframe = pq.read_table(self.parquet_path).to_pandas(
+                types_mapper=pd.ArrowDtype
+            )
+            return self
+
+        parse_options = pacsv.ParseOptions(delimiter=separator)
+        convert_options = pacsv.ConvertOptions(
+            column_types={
+                column: arrow_type(dtype)
+                for column, dtype in (self.dtype_schema or dict()).items()
+            }
+        )
+        self.dataframe = pacsv.read_csv(
+            self.csv_path,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        ).to_pandas(types_mapper=pd.ArrowDtype)
         return self
 
+    def read_chunks(self, separator: str = ";") -> Iterator[pd.DataFrame]:
+        """
+        Reads the CSV in chunks of chunksize rows. Each call starts a new reader.
+
+        Args:
+            separator: separator used by the CSV. Default is ";"
+
+        Returns:
+            Iterator[pd.DataFrame]: chunks of the CSV.
+        """
+        return pd.read_csv(
+            self.csv_path,
+            sep=separator,
+            chunksize=self.chunksize,
+            dtype=self.dtype_schema,
+            engine="c",
+        )
+
     def dataframe_to_csv(self, separator: str = ";"):
         """
-        Export DataFrame to a CSV.
+        Export DataFrame to a CSV, and a Parquet copy for faster re-imports.
+        Does nothing for chunked tables, the CSV is their only copy. Frames
+        Arrow cannot store, such as columns mixing ints and strings after
+        normalise_data, get no Parquet copy and any stale one is removed.
 
         Args:
             separator: separator used by the CSV. Default is ";"
@@ -127,7 +328,21 @@ class DBTable:
         Returns:
             DBTable: Self
         """
+        if self.chunksize is not None:
+            return self
         self.dataframe.to_csv(sep=separator, path_or_buf=self.csv_path)
+        try:
+            table = pa.Table.from_pandas(self.dataframe, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            self.parquet_path.unlink(missing_ok=True)
+            return self
+        table = table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or dict()),
+                PARQUET_SCHEMA_KEY: self._schema_metadata(),
+            }
+        )
+        pq.write_table(table, self.parquet_path, compression="zstd")
         return self
 
     def add(self) -> DBTable:
@@ -0,0 +1,175 @@
+"""
+Tests for Database and DatabaseGenerator.
+"""
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.database.database import Database, DatabaseGenerator
+from src.database.table import DBTable
+
+
+class DatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.database = Database("t", folder=self.folder)
+        self.addCleanup(self.database.disconnect)
+
+    def rows(self, name: str) -> list[tuple]:
+        return self.database.cursor.execute(f'SELECT * FROM "{name}"').fetchall()
+
+
+class TestInsertDataFrame(DatabaseTestCase):
+    def test_types_and_missing_values(self):
+        dataframe = pd.DataFrame(
+            {
+                "a": ["x", None],
+                "b": [1.5, None],
+                "c": pd.array([1, None], dtype="Int64"),
+            }
+        )
+        with self.database.transaction():
+            self.database.insert_dataframe("x", dataframe, "XID", "replace")
+        self.assertEqual(self.rows("x"), [(0, "x", 1.5, 1), (1, None, None, None)])
+        columns = self.database.cursor.execute("PRAGMA table_info(x)").fetchall()
+        self.assertEqual(
+            [(column[1], column[2]) for column in columns],
+            [("XID", "INTEGER"), ("a", "TEXT"), ("b", "REAL"), ("c", "INTEGER")],
+        )
+
+    def test_replace_and_append(self):
+        dataframe = pd.DataFrame({"a": [1, 2]})
+        with self.database.transaction():
+            self.database.insert_dataframe("x", dataframe, "XID", "replace")
+            self.database.insert_dataframe("x", dataframe, "XID", "append")
+        self.assertEqual(len(self.rows("x")), 4)
+        with self.database.transaction():
+            self.database.insert_dataframe("x", dataframe, "XID", "replace")
+        self.assertEqual(len(self.rows("x")), 2)
+
+    def test_quotes_in_identifiers(self):
+        dataframe = pd.DataFrame({'a"b': [1]})
+        with self.database.transaction():
+            self.database.insert_dataframe('x"y', dataframe, 'X"ID', "replace")
+        self.assertEqual(self.rows('x""y'), [(0, 1)])
+
+    def test_temporal_columns(self):
+        dataframe = pd.DataFrame(
+            {
+                "when": pd.to_datetime(["2020-01-01 10:00:00", None]),
+                "took": pd.to_timedelta(["1s", None]),
+            }
+        )
+        with self.database.transaction():
+            self.database.insert_dataframe("x", dataframe, "XID", "replace")
+        self.assertEqual(
+            self.rows("x"),
+            [(0, "2020-01-01 10:00:00", 1_000_000_000), (1, None, None)],
+        )
+
+
+class TestTransaction(DatabaseTestCase):
+    def other_connection_rows(self, name: str) -> list[tuple]:
+        connection = sqlite3.connect(self.database.path)
+        try:
+            return connection.execute(f'SELECT * FROM "{name}"').fetchall()
+        finally:
+            connection.close()
+
+    def test_nested_commits_once(self):
+        dataframe = pd.DataFrame({"a": [1]})
+        with self.database.transaction():
+            with self.database.transaction():
+                self.database.insert_dataframe("x", dataframe, "XID", "replace")
+            self.assertEqual(self.database.transaction_depth, 1)
+            self.assertTrue(self.database.connection.in_transaction)
+            with self.assertRaises(sqlite3.OperationalError):
+                self.other_connection_rows("x")
+        self.assertEqual(self.database.transaction_depth, 0)
+        self.assertFalse(self.database.connection.in_transaction)
+        self.assertEqual(self.other_connection_rows("x"), [(0, 1)])
+
+    def test_rollback_undoes_ddl_and_rows(self):
+        with self.database.transaction():
+            self.database.insert_dataframe(
+                "x", pd.DataFrame({"a": [1, 2]}), "XID", "replace"
+            )
+        with self.assertRaises(RuntimeError):
+            with self.database.transaction():
+                with self.database.transaction():
+                    self.database.insert_dataframe(
+                        "x", pd.DataFrame({"b": ["y"]}), "XID", "replace"
+                    )
+                    raise RuntimeError
+        self.assertEqual(self.database.transaction_depth, 0)
+        self.assertEqual(self.rows("x"), [(0, 1), (1, 2)])
+
+
+class TestAddTable(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.folder / "t_x.csv"
+        self.csv_path.write_text("XID;a\n0;x\n1;y\n2;z\n")
+
+    def test_tables_by_name(self):
+        table = DBTable(name="x", db_name="t", csv_path=self.csv_path)
+        table.index_label = "XID"
+        self.database.add_table(table.modify_index())
+        self.assertIs(self.database.x, table)
+        with self.assertRaises(AttributeError):
+            self.database.y
+
+    def test_datetime_column(self):
+        csv_path = self.folder / "t_y.csv"
+        csv_path.write_text("YID;when;n\n0;2020-01-01 10:00:00;1\n1;;2\n")
+        table = DBTable(name="y", db_name="t", csv_path=csv_path)
+        table.index_label = "YID"
+        self.database.add_table(table.modify_index())
+        self.assertEqual(
+            self.rows("y"), [(0, "2020-01-01 10:00:00", 1), (1, None, 2)]
+        )
+
+    def test_chunked_table_can_be_added_twice(self):
+        table = DBTable(name="x", db_name="t", csv_path=self.csv_path, chunksize=2)
+        table.index_label = "XID"
+        self.database.add_table(table)
+        self.database.add_table(table)
+        self.assertEqual(self.rows("x"), [(0, "x"), (1, "y"), (2, "z")])
+
+
+class TestDatabaseGenerator(unittest.TestCase):
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        for name in ("x", "y"):
+            Path(self.folder, f"t_{name}.csv").write_text("a;b\nx;1\n")
+
+    def tables(self) -> dict[str, DBTable]:
+        tables = dict()
+        for name in ("x", "y"):
+            table = DBTable(
+                name=name, db_name="t", csv_path=self.folder / f"t_{name}.csv"
+            )
+            table.index_label = "ID"
+            tables[f"t_{name}"] = table.modify_index()
+        return tables
+
+    def test_each_call_builds_fresh_databases(self):
+        first = DatabaseGenerator.create_from_dict(self.tables())["t"]
+        first.disconnect()
+        second = DatabaseGenerator.create_from_dict(self.tables())["t"]
+        self.addCleanup(second.disconnect)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.table_names, ["x", "y"])
+        self.assertEqual(second.show_tables(), ("x", "y"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests for importing csv files.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.database.import_csv import (
+    database_is_current,
+    gather_csv_paths,
+    mark_database_built,
+)
+
+
+class TestGatherCsvPaths(unittest.TestCase):
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+
+    def test_names_split_on_first_underscore(self):
+        Path(self.folder, "students_math_g1.csv").write_text("a;b\nx;1\n")
+        Path(self.folder, "ignored.csv").write_text("a;b\nx;1\n")
+        tables = gather_csv_paths(self.folder)
+        self.assertEqual(list(tables), ["students_math_g1"])
+        table = tables["students_math_g1"]
+        self.assertEqual((table.db_name, table.name), ("students", "math_g1"))
+
+    def test_dtype_schemas_by_stem(self):
+        Path(self.folder, "students_math.csv").write_text("a;b\nx;1\n")
+        Path(self.folder, "students_other.csv").write_text("a;b\nx;1\n")
+        tables = gather_csv_paths(self.folder, {"students_math": {"b": "int8"}})
+        math = tables["students_math"].dataframe
+        other = tables["students_other"].dataframe
+        self.assertEqual(str(math["b"].dtype), "int8[pyarrow]")
+        self.assertEqual(str(other["b"].dtype), "int64[pyarrow]")
+
+    def test_tables_match_their_files(self):
+        for database_name in ("a", "b"):
+            for table_name in ("x", "y", "z"):
+                Path(self.folder, f"{database_name}_{table_name}.csv").write_text(
+                    f"{table_name};b\n{database_name};1\n"
+                )
+        tables = gather_csv_paths(self.folder)
+        self.assertEqual(len(tables), 6)
+        for stem, table in tables.items():
+            self.assertEqual(f"{table.db_name}_{table.name}", stem)
+            self.assertEqual(table.csv_path.stem, stem)
+            self.assertEqual(table.dataframe.columns[0], table.name)
+            self.assertEqual(table.dataframe.iloc[0, 0], table.db_name)
+
+    def test_empty_folder(self):
+        self.assertEqual(gather_csv_paths(self.folder), dict())
+
+
+class TestDatabaseIsCurrent(unittest.TestCase):
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.csv_path = Path(self.folder, "t_x.csv")
+        self.csv_path.write_text("a;b\nx;1\n")
+        Path(self.folder, "t.db").touch()
+        os.utime(self.csv_path, (1000, 1000))
+
+    def test_not_built(self):
+        # The .db alone is newer than the CSV, but was never marked as built.
+        self.assertFalse(database_is_current(self.folder, "t"))
+
+    def test_built_after_csv(self):
+        mark_database_built(self.folder, "t")
+        self.assertTrue(database_is_current(self.folder, "t"))
+
+    def test_csv_changed_after_build(self):
+        marker = mark_database_built(self.folder, "t")
+        os.utime(marker, (1000, 1000))
+        os.utime(self.csv_path, (2000, 2000))
+        self.assertFalse(database_is_current(self.folder, "t"))
+
+    def test_missing_database(self):
+        mark_database_built(self.folder, "t")
+        Path(self.folder, "t.db").unlink()
+        self.assertFalse(database_is_current(self.folder, "t"))
+
+
+if __name__ == "__main__":
+    unittest.main()